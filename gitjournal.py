@@ -23,29 +23,161 @@ Usage:
     gitjournal --export-html       # Export for OneNote
     gitjournal --all-repos         # Aggregate all repos
     gitjournal --init              # Initialize journaling for current repo
+    gitjournal --compact           # Rebuild devlog from hook journal entries
 """
 
 import os
+import re
 import sys
+import io
 import json
+import heapq
+import shlex
 import subprocess
 import argparse
+import copy
+import functools
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Optional: orjson parses and serializes config/repos JSON much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 CONFIG_DIR = os.path.expanduser("~/.gitjournal")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
 REPOS_FILE = os.path.join(CONFIG_DIR, "repos.json")
 
+# Per-repo journal appended to by the post-commit hook
+ENTRIES_FILE = os.path.join(".gitjournal", "entries.ndjson")
+
+# Conventional commit parsing for changelog categories
+_CC_RE = re.compile(r'^(\w+)(?:\([^)]+\))?:\s*(.+)$')
+
+_TYPE_MAP = {
+    'feat': 'Added',
+    'fix': 'Fixed',
+    'docs': 'Documentation',
+    'refactor': 'Changed',
+    'perf': 'Performance',
+    'test': 'Testing',
+    'chore': 'Maintenance',
+    'breaking': 'Breaking Changes',
+    'security': 'Security',
+    'deprecate': 'Deprecated',
+    'remove': 'Removed'
+}
+
+# Keyword fallback for non-conventional messages, checked in order
+_FALLBACK_KEYWORDS = (
+    ('Added', ('add', 'new', 'create', 'implement', 'feature')),
+    ('Fixed', ('fix', 'bug', 'patch', 'resolve', 'correct')),
+    ('Removed', ('remove', 'delete', 'drop')),
+    ('Changed', ('update', 'change', 'modify', 'refactor', 'improve')),
+    ('Documentation', ('doc', 'readme', 'comment')),
+    ('Security', ('security', 'vulnerability', 'cve')),
+)
+
+# Inline markdown for HTML export
+_STRONG_RE = re.compile(r'\*\*(.+?)\*\*')
+_CODE_RE = re.compile(r'`(.+?)`')
+
+# Block-level markdown markers (text before the first space) and their tags
+_BLOCK_TAGS = {'#': 'h1', '##': 'h2', '###': 'h3', '-': 'li'}
+
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# Folders never searched for repositories by --scan
+SKIP_DIRS = frozenset({'node_modules', 'venv', 'env', '__pycache__', 'vendor', 'build', 'dist'})
+
+# Batch operations are bound by git subprocesses, not the GIL
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _json_load(path):
+    """Load JSON from a file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _json_parse(data):
+    """Parse a JSON document from a string"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_append_line(path, obj):
+    """Append obj to a newline-delimited JSON file in a single write"""
+    if orjson is not None:
+        line = orjson.dumps(obj) + b'\n'
+    else:
+        line = (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+    with open(path, 'ab') as f:
+        f.write(line)
+
+
+def _tail_lines(path, n, block_size=8192):
+    """Return the last n lines of a file, reading backwards from the end"""
+    if n <= 0:
+        return []
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # n + 1 newlines guarantees n complete lines after the first break
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    # Split the raw bytes on '\n' only: str.splitlines() would also break on
+    # U+2028, U+0085 and friends, which JSON writers leave unescaped
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    return [line.decode('utf-8', 'replace') for line in lines[-n:]]
+
+
+def _json_dump(path, obj):
+    """Atomically write JSON to a file with 2-space indentation"""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode('utf-8')
+    # A unique temp file per writer, so concurrent saves can't truncate
+    # each other's file before os.replace
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+        suffix='.tmp', delete=False
+    ) as f:
+        try:
+            f.write(data)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
 
 class GitJournal:
-    def __init__(self, repo_path=None):
-        self.repo_path = repo_path or os.getcwd()
+    def __init__(self, repo_path=None, out=None):
+        self.repo_path = Path(repo_path or os.getcwd())
+        self.out = out or sys.stdout
+        self._is_repo_cache = {}
         self._ensure_config_dir()
         self.config = self._load_config()
         self.repos = self._load_repos()
+        self._repos_disk = copy.deepcopy(self.repos)
     
     def _ensure_config_dir(self):
         """Create config directory if it doesn't exist"""
@@ -54,8 +186,7 @@ class GitJournal:
     def _load_config(self):
         """Load global configuration"""
         if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            return _json_load(CONFIG_FILE)
         return {
             'default_devlog': 'DEVLOG.md',
             'default_changelog': 'CHANGELOG.md',
@@ -66,20 +197,20 @@ class GitJournal:
     
     def _save_config(self):
         """Save global configuration"""
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        _json_dump(CONFIG_FILE, self.config)
     
     def _load_repos(self):
         """Load tracked repositories"""
         if os.path.exists(REPOS_FILE):
-            with open(REPOS_FILE, 'r') as f:
-                return json.load(f)
+            return _json_load(REPOS_FILE)
         return {}
     
     def _save_repos(self):
-        """Save tracked repositories"""
-        with open(REPOS_FILE, 'w') as f:
-            json.dump(self.repos, f, indent=2)
+        """Save tracked repositories, skipping the write if nothing changed"""
+        if self.repos == self._repos_disk:
+            return
+        _json_dump(REPOS_FILE, self.repos)
+        self._repos_disk = copy.deepcopy(self.repos)
     
     def _run_git(self, *args, cwd=None):
         """Run a git command and return output"""
@@ -87,158 +218,169 @@ class GitJournal:
         result = subprocess.run(
             cmd, 
             capture_output=True, 
-            text=True, 
+            encoding='utf-8',
+            errors='replace',
             cwd=cwd or self.repo_path
         )
         return result.stdout.strip(), result.returncode
     
     def _is_git_repo(self, path=None):
-        """Check if path is a git repository"""
-        _, code = self._run_git('rev-parse', '--git-dir', cwd=path or self.repo_path)
-        return code == 0
+        """Check if path is a git repository, cached per path"""
+        path = path or self.repo_path
+        is_repo = self._is_repo_cache.get(path)
+        if is_repo is None:
+            _, code = self._run_git('rev-parse', '--git-dir', cwd=path)
+            is_repo = self._is_repo_cache[path] = code == 0
+        return is_repo
     
     def _get_repo_name(self, path=None):
         """Get repository name from remote or folder"""
-        remote, _ = self._run_git('remote', 'get-url', 'origin', cwd=path or self.repo_path)
-        if remote:
+        remote, code = self._run_git('remote', 'get-url', 'origin', cwd=path or self.repo_path)
+        if code == 0 and remote:
             # Extract repo name from URL
             name = remote.split('/')[-1].replace('.git', '')
             return name
-        return os.path.basename(path or self.repo_path)
+        return Path(path or self.repo_path).name
+    
+    @functools.cached_property
+    def repo_name(self):
+        """Repository name for this journal's repo_path"""
+        return self._get_repo_name()
     
-    def _get_commits(self, limit=None, since_tag=None, cwd=None):
-        """Get commits from repository"""
-        cmd_args = ['log', '--pretty=format:%H|%ad|%s|%b', '--date=short']
+    @functools.cached_property
+    def _devlog_path(self):
+        """Path of this repository's devlog"""
+        return self.repo_path / self.config['default_devlog']
+    
+    def _iter_commits(self, limit=None, since_tag=None, cwd=None):
+        """Yield commits from repository as git log streams them"""
+        cmd = [
+            'git', 'log', '-z', '--no-merges', '--no-renames', '--encoding=UTF-8',
+            '--format=%H%x1f%ad%x1f%s%x1f%b', '--date=short'
+        ]
         if limit:
-            cmd_args.append(f'-{limit}')
+            cmd.append(f'-{limit}')
         if since_tag:
-            cmd_args.append(f'{since_tag}..HEAD')
+            cmd.append(f'{since_tag}..HEAD')
         
-        output, code = self._run_git(*cmd_args, cwd=cwd or self.repo_path)
-        
-        if code != 0 or not output:
-            return []
-        
-        commits = []
-        for line in output.split('\n'):
-            if '|' not in line:
-                continue
-            parts = line.split('|', 3)
-            if len(parts) >= 3:
-                commits.append({
-                    'hash': parts[0][:7],
-                    'date': parts[1],
-                    'message': parts[2],
-                    'body': parts[3] if len(parts) > 3 else ''
-                })
-        
-        return commits
-    
-    def _categorize_commit(self, message):
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd or self.repo_path
+        ) as proc:
+            try:
+                # Records are NUL-terminated and fields separated by \x1f, neither
+                # of which git emits inside a message; split the raw bytes and
+                # decode per record so a stray non-UTF-8 byte can't drop a commit
+                pending = b''
+                for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+                    *records, pending = (pending + chunk).split(b'\0')
+                    for record in records:
+                        parts = record.decode('utf-8', 'replace').split('\x1f', 3)
+                        if len(parts) >= 3:
+                            yield {
+                                'hash': parts[0][:7],
+                                'full_hash': parts[0],
+                                'date': parts[1],
+                                'message': parts[2],
+                                'body': parts[3] if len(parts) > 3 else ''
+                            }
+            except GeneratorExit:
+                # Consumer stopped early: end git now rather than letting it
+                # run on until its next write hits the closed pipe
+                proc.terminate()
+                raise
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _categorize_commit(message):
         """Categorize commit based on conventional commit format"""
-        import re
-        
-        message_lower = message.lower()
+        # Fast path for unscoped conventional commits: type: message.
+        # Mapping '_' to an alnum char makes isalnum() match _CC_RE's \w+
+        # exactly (isidentifier() also admits non-alnum chars such as U+2118)
+        commit_type, sep, description = message.partition(':')
+        if sep and commit_type.replace('_', 'x').isalnum():
+            description = description.lstrip()
+            if description:
+                return _TYPE_MAP.get(commit_type.lower(), 'Changed'), description
         
         # Conventional commits: type(scope): message
-        match = re.match(r'^(\w+)(?:\([^)]+\))?:\s*(.+)$', message)
+        match = _CC_RE.match(message)
         if match:
             commit_type = match.group(1).lower()
             description = match.group(2)
-            
-            type_mapping = {
-                'feat': 'Added',
-                'fix': 'Fixed',
-                'docs': 'Documentation',
-                'refactor': 'Changed',
-                'perf': 'Performance',
-                'test': 'Testing',
-                'chore': 'Maintenance',
-                'breaking': 'Breaking Changes',
-                'security': 'Security',
-                'deprecate': 'Deprecated',
-                'remove': 'Removed'
-            }
-            return type_mapping.get(commit_type, 'Changed'), description
-        
-        # Fallback: keyword detection
-        if any(w in message_lower for w in ['add', 'new', 'create', 'implement', 'feature']):
-            return 'Added', message
-        elif any(w in message_lower for w in ['fix', 'bug', 'patch', 'resolve', 'correct']):
-            return 'Fixed', message
-        elif any(w in message_lower for w in ['remove', 'delete', 'drop']):
-            return 'Removed', message
-        elif any(w in message_lower for w in ['update', 'change', 'modify', 'refactor', 'improve']):
-            return 'Changed', message
-        elif any(w in message_lower for w in ['doc', 'readme', 'comment']):
-            return 'Documentation', message
-        elif any(w in message_lower for w in ['security', 'vulnerability', 'cve']):
-            return 'Security', message
+            return _TYPE_MAP.get(commit_type, 'Changed'), description
+        
+        # Fallback: keyword detection (substring scans stay in C and beat a
+        # combined regex, which has to try every keyword at every position)
+        message_lower = message.lower()
+        for category, keywords in _FALLBACK_KEYWORDS:
+            if any(w in message_lower for w in keywords):
+                return category, message
         
         return 'Changed', message
     
-    def generate_devlog(self, output_file=None):
+    def generate_devlog(self, output_file=None, recorded_files=None):
         """Generate DEVLOG.md for current repository"""
         if not self._is_git_repo():
-            print(f"❌ Not a git repository: {self.repo_path}")
+            print(f"❌ Not a git repository: {self.repo_path}", file=self.out)
             return None
         
-        repo_name = self._get_repo_name()
-        commits = self._get_commits(limit=self.config['max_commits_in_devlog'])
-        
-        if not commits:
-            print("No commits found")
-            return None
+        repo_name = self.repo_name
         
-        devlog = f"""# Development Log - {repo_name}
+        parts = [f"""# Development Log - {repo_name}
 
 Auto-generated journal of project changes.
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
-"""
+"""]
+        append = parts.append
         
-        for commit in commits:
-            if commit['message'].startswith('Merge'):
-                continue
-            
-            devlog += f"""## {commit['date']}
-
-**Commit:** `{commit['hash']}`
-
-{commit['message']}
-
-"""
-            if commit['body'].strip():
-                devlog += f"{commit['body'].strip()}\n\n"
-            
-            devlog += "---\n\n"
+        recorded_files = recorded_files or {}
+        for commit in self._iter_commits(limit=self.config['max_commits_in_devlog']):
+            append(self._devlog_entry(
+                commit['date'], commit['hash'], commit['message'], commit['body'],
+                recorded_files.get(commit['full_hash'])
+            ))
         
-        output_file = output_file or os.path.join(self.repo_path, self.config['default_devlog'])
+        if len(parts) == 1:
+            print("No commits found", file=self.out)
+            return None
         
-        with open(output_file, 'w') as f:
-            f.write(devlog)
+        output_file = Path(output_file or self._devlog_path)
+        output_file.write_text(''.join(parts), encoding='utf-8')
         
-        print(f"✅ Generated: {output_file}")
+        print(f"✅ Generated: {output_file}", file=self.out)
         return output_file
     
+    def _devlog_entry(self, date, commit_hash, message, body, files=None):
+        """Format one devlog entry; files is only known for hook-recorded commits"""
+        entry = f"""## {date}
+
+**Commit:** `{commit_hash}`
+
+{message}
+
+"""
+        body = body.strip()
+        if body:
+            entry += f"{body}\n\n"
+        if files is not None:
+            entry += f"**Files:** {','.join(files)}\n\n"
+        return entry + "---\n\n"
+    
     def generate_changelog(self, output_file=None):
         """Generate CHANGELOG.md with categorized commits"""
         if not self._is_git_repo():
-            print(f"❌ Not a git repository: {self.repo_path}")
+            print(f"❌ Not a git repository: {self.repo_path}", file=self.out)
             return None
         
-        repo_name = self._get_repo_name()
-        commits = self._get_commits()
-        
-        if not commits:
-            print("No commits found")
-            return None
+        repo_name = self.repo_name
         
         # Group by category
         categories = defaultdict(list)
-        for commit in commits:
-            if commit['message'].startswith('Merge'):
-                continue
+        for commit in self._iter_commits():
             category, description = self._categorize_commit(commit['message'])
             categories[category].append({
                 'description': description,
@@ -246,14 +388,19 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
                 'date': commit['date']
             })
         
-        changelog = f"""# Changelog - {repo_name}
+        if not categories:
+            print("No commits found", file=self.out)
+            return None
+        
+        parts = [f"""# Changelog - {repo_name}
 
 All notable changes to this project will be documented in this file.
 Auto-generated from git commits.
 
 ## [Unreleased] - {datetime.now().strftime('%Y-%m-%d')}
 
-"""
+"""]
+        append = parts.append
         
         category_order = [
             'Breaking Changes', 'Added', 'Changed', 'Fixed',
@@ -263,130 +410,142 @@ Auto-generated from git commits.
         
         for category in category_order:
             if category in categories:
-                changelog += f"### {category}\n\n"
+                append(f"### {category}\n\n")
                 for item in categories[category]:
-                    changelog += f"- {item['description']} (`{item['hash']}`)\n"
-                changelog += "\n"
+                    append(f"- {item['description']} (`{item['hash']}`)\n")
+                append("\n")
         
-        output_file = output_file or os.path.join(self.repo_path, self.config['default_changelog'])
+        output_file = Path(output_file or self.repo_path / self.config['default_changelog'])
+        output_file.write_text(''.join(parts), encoding='utf-8')
         
-        with open(output_file, 'w') as f:
-            f.write(changelog)
-        
-        print(f"✅ Generated: {output_file}")
+        print(f"✅ Generated: {output_file}", file=self.out)
         return output_file
     
-    def install_hook(self):
+    def install_hook(self, save=True):
         """Install post-commit hook for auto-updating devlog"""
         if not self._is_git_repo():
-            print(f"❌ Not a git repository: {self.repo_path}")
+            print(f"❌ Not a git repository: {self.repo_path}", file=self.out)
             return False
         
-        hooks_dir = os.path.join(self.repo_path, '.git', 'hooks')
-        hook_file = os.path.join(hooks_dir, 'post-commit')
+        hook_file = self.repo_path / '.git' / 'hooks' / 'post-commit'
         
-        hook_content = '''#!/bin/bash
-# Auto-update DEVLOG.md after each commit
+        # The hook hands off to this script so each commit costs one git call
+        # instead of a shell pipeline of them
+        script = shlex.quote(os.path.realpath(__file__))
+        hook_content = f'''#!/bin/sh
+# Record each commit in .gitjournal/entries.ndjson
 # Installed by gitjournal
 
-DEVLOG="DEVLOG.md"
-
-# Get commit info
-COMMIT_HASH=$(git rev-parse --short HEAD)
-COMMIT_DATE=$(git log -1 --format=%cd --date=format:'%Y-%m-%d %H:%M')
-COMMIT_MSG=$(git log -1 --format=%s)
-COMMIT_BODY=$(git log -1 --format=%b)
-FILES_CHANGED=$(git diff-tree --no-commit-id --name-only -r HEAD | tr '\\n' ', ' | sed 's/,$//')
-
-# Create entry
-ENTRY="## $COMMIT_DATE
-
-**Commit:** `$COMMIT_HASH`
-
-$COMMIT_MSG
-
-"
-
-if [ -n "$COMMIT_BODY" ]; then
-    ENTRY+="$COMMIT_BODY
-
-"
-fi
-
-ENTRY+="**Files:** $FILES_CHANGED
-
----
-
-"
-
-# Update DEVLOG.md
-if [ -f "$DEVLOG" ]; then
-    head -5 "$DEVLOG" > "$DEVLOG.tmp"
-    echo "$ENTRY" >> "$DEVLOG.tmp"
-    tail -n +6 "$DEVLOG" >> "$DEVLOG.tmp"
-    mv "$DEVLOG.tmp" "$DEVLOG"
-else
-    REPO_NAME=$(basename $(git rev-parse --show-toplevel))
-    echo "# Development Log - $REPO_NAME
-
-Auto-generated journal of project changes.
-
-$ENTRY" > "$DEVLOG"
-fi
-
-git add "$DEVLOG" 2>/dev/null || true
-echo "📝 DEVLOG.md updated"
+exec python3 {script} --hook-update
 '''
         
-        with open(hook_file, 'w') as f:
-            f.write(hook_content)
+        hook_file.write_text(hook_content, encoding='utf-8')
+        hook_file.chmod(0o755)
+        print(f"✅ Installed post-commit hook: {hook_file}", file=self.out)
         
-        os.chmod(hook_file, 0o755)
-        print(f"✅ Installed post-commit hook: {hook_file}")
+        # Keep the hook's journal out of the working tree status
+        self._add_to_gitignore(['.gitjournal/'])
         
-        # Track this repo
-        repo_name = self._get_repo_name()
+        # Track this repo (re-installing keeps the original 'added' time,
+        # so an unchanged entry doesn't rewrite repos.json)
+        repo_name = self.repo_name
+        tracked = self.repos.get(repo_name)
+        if tracked and tracked.get('path') == str(self.repo_path):
+            added = tracked.get('added')
+        else:
+            added = datetime.now().isoformat()
         self.repos[repo_name] = {
-            'path': self.repo_path,
-            'added': datetime.now().isoformat(),
+            'path': str(self.repo_path),
+            'added': added,
             'hook_installed': True
         }
-        self._save_repos()
+        if save:
+            self._save_repos()
+        
+        return True
+    
+    def hook_update(self):
+        """Record the latest commit in the journal (run by the post-commit hook)"""
+        # Commit info and changed files from a single git call
+        output, code = self._run_git(
+            'log', '-1', '-z', '--name-only', '--encoding=UTF-8',
+            '--format=%H%x1f%cd%x1f%s%x1f%b', '--date=format:%Y-%m-%d %H:%M', 'HEAD'
+        )
+        header, _, files = output.partition('\0')
+        fields = header.split('\x1f', 3)
+        if code != 0 or len(fields) < 3:
+            return False
+        
+        record = {
+            'hash': fields[0],
+            'date': fields[1],
+            'msg': fields[2],
+            'body': fields[3].strip() if len(fields) > 3 else '',
+            'files': [f for f in files.lstrip('\n').split('\0') if f]
+        }
         
+        # O(1) append instead of rewriting the devlog on every commit;
+        # --compact renders the markdown from these entries
+        entries_file = self.repo_path / ENTRIES_FILE
+        entries_file.parent.mkdir(exist_ok=True)
+        _json_append_line(entries_file, record)
+        
+        print("📝 Journal entry recorded", file=self.out)
         return True
     
-    def init_repo(self):
+    def compact_devlog(self):
+        """Regenerate the devlog from git history plus the files recorded by the hook"""
+        entries_file = self.repo_path / ENTRIES_FILE
+        
+        # Git history is the backbone, so pulled commits and commits made
+        # before the hook keep their place, and records for commits amended,
+        # rebased or reset away are never looked up. Later lines win.
+        recorded_files = {}
+        if entries_file.exists():
+            for line in _tail_lines(entries_file, self.config['max_commits_in_devlog']):
+                try:
+                    record = _json_parse(line)
+                    recorded_files[record['hash']] = [str(f) for f in record['files']]
+                except (ValueError, KeyError, TypeError):
+                    continue  # Skip a torn or hand-edited line
+        
+        return self.generate_devlog(recorded_files=recorded_files)
+    
+    def _add_to_gitignore(self, entries):
+        """Append any of entries missing from the repository's .gitignore"""
+        gitignore_path = self.repo_path / '.gitignore'
+        
+        existing = ''
+        if gitignore_path.exists():
+            existing = gitignore_path.read_text(encoding='utf-8')
+        
+        missing = [entry for entry in entries if entry not in existing]
+        if missing:
+            with gitignore_path.open('a', encoding='utf-8') as f:
+                for entry in missing:
+                    f.write(f"\n{entry}")
+    
+    def init_repo(self, save=True):
         """Initialize journaling for current repository"""
         if not self._is_git_repo():
-            print(f"❌ Not a git repository: {self.repo_path}")
+            print(f"❌ Not a git repository: {self.repo_path}", file=self.out)
             return False
         
-        print(f"\n📁 Initializing journaling for: {self._get_repo_name()}\n")
+        print(f"\n📁 Initializing journaling for: {self.repo_name}\n", file=self.out)
         
         # Generate initial devlog
         self.generate_devlog()
         
         # Install hook
-        self.install_hook()
+        self.install_hook(save=save)
         
         # Add to .gitignore if needed
-        gitignore_path = os.path.join(self.repo_path, '.gitignore')
-        gitignore_entries = ['*_onenote.html']
-        
-        existing = ''
-        if os.path.exists(gitignore_path):
-            with open(gitignore_path, 'r') as f:
-                existing = f.read()
-        
-        with open(gitignore_path, 'a') as f:
-            for entry in gitignore_entries:
-                if entry not in existing:
-                    f.write(f"\n{entry}")
+        self._add_to_gitignore(['*_onenote.html'])
         
-        print(f"\n✅ Repository initialized for journaling!")
-        print(f"   - DEVLOG.md created")
-        print(f"   - Post-commit hook installed")
-        print(f"   - Repository tracked in ~/.gitjournal/repos.json")
+        print(f"\n✅ Repository initialized for journaling!", file=self.out)
+        print(f"   - DEVLOG.md created", file=self.out)
+        print(f"   - Post-commit hook installed", file=self.out)
+        print(f"   - Repository tracked in ~/.gitjournal/repos.json", file=self.out)
         
         return True
     
@@ -394,28 +553,27 @@ echo "📝 DEVLOG.md updated"
         """Export devlog to OneNote-friendly HTML"""
         # Check for file in this order: specified file, DEVLOG.md, COMBINED_DEVLOG.md
         if markdown_file and os.path.exists(markdown_file):
-            pass  # Use specified file
+            markdown_file = Path(markdown_file)  # Use specified file
         elif markdown_file is None:
             # Try default devlog first
-            default_devlog = os.path.join(self.repo_path, self.config['default_devlog'])
-            combined_devlog = os.path.join(CONFIG_DIR, 'COMBINED_DEVLOG.md')
+            default_devlog = self._devlog_path
+            combined_devlog = Path(CONFIG_DIR) / 'COMBINED_DEVLOG.md'
             
-            if os.path.exists(default_devlog):
+            if default_devlog.exists():
                 markdown_file = default_devlog
-            elif os.path.exists(combined_devlog):
+            elif combined_devlog.exists():
                 markdown_file = combined_devlog
             else:
-                print(f"No devlog found. Run 'gitjournal' or 'gitjournal --all-repos' first.")
+                print(f"No devlog found. Run 'gitjournal' or 'gitjournal --all-repos' first.", file=self.out)
                 return None
         else:
-            print(f"File not found: {markdown_file}")
+            print(f"File not found: {markdown_file}", file=self.out)
             return None
         
-        with open(markdown_file, 'r') as f:
-            content = f.read()
+        content = markdown_file.read_text(encoding='utf-8')
         
         html_content = self._markdown_to_html(content)
-        repo_name = self._get_repo_name()
+        repo_name = self.repo_name
         
         full_html = f"""<!DOCTYPE html>
 <html>
@@ -470,12 +628,10 @@ echo "📝 DEVLOG.md updated"
 </html>
 """
         
-        output_file = markdown_file.replace('.md', '_onenote.html')
-        
-        with open(output_file, 'w') as f:
-            f.write(full_html)
+        output_file = markdown_file.with_name(f'{markdown_file.stem}_onenote.html')
+        output_file.write_text(full_html, encoding='utf-8')
         
-        print(f"✅ Exported: {output_file}")
+        print(f"✅ Exported: {output_file}", file=self.out)
         
         # Open in browser
         subprocess.run(['open', output_file])
@@ -484,43 +640,62 @@ echo "📝 DEVLOG.md updated"
     
     def _markdown_to_html(self, text):
         """Convert markdown to HTML"""
-        import re
-        
-        lines = text.split('\n')
         html = []
+        append = html.append
         in_code = False
+        open_group = None  # 'ul' or 'p' while consecutive lines are grouped
         
-        for line in lines:
-            if line.startswith('```'):
-                html.append('</pre>' if in_code else '<pre>')
-                in_code = not in_code
-                continue
-            
+        for line in text.split('\n'):
             if in_code:
-                html.append(line.replace('<', '&lt;').replace('>', '&gt;'))
+                if line.startswith('```'):
+                    append('</pre>')
+                    in_code = False
+                else:
+                    append(line.translate(_HTML_ESCAPE))
                 continue
             
-            if line.startswith('## '):
-                html.append(f'<h2>{line[3:]}</h2>')
-            elif line.startswith('### '):
-                html.append(f'<h3>{line[4:]}</h3>')
-            elif line.startswith('# '):
-                html.append(f'<h1>{line[2:]}</h1>')
-            elif line.strip() == '---':
-                html.append('<hr/>')
-            elif line.startswith('- '):
-                html.append(f'<li>{line[2:]}</li>')
-            elif '**' in line:
-                line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
-                html.append(f'<p>{line}</p>')
-            elif '`' in line:
-                line = re.sub(r'`(.+?)`', r'<code>\1</code>', line)
-                html.append(f'<p>{line}</p>')
-            elif line.strip():
-                html.append(f'<p>{line}</p>')
+            # Headings and list items: one dict lookup on the leading marker
+            marker, sep, rest = line.partition(' ')
+            tag = _BLOCK_TAGS.get(marker) if sep else None
+            stripped = line.strip()
+            if tag == 'li':
+                group = 'ul'
+            elif tag or not stripped or stripped == '---' or line.startswith('```'):
+                group = None
+            else:
+                group = 'p'
+            
+            # Consecutive list items share one <ul>, consecutive text lines
+            # one <p>; any other line closes the open group
+            if group != open_group:
+                if open_group:
+                    append(f'</{open_group}>')
+                if group:
+                    append(f'<{group}>')
+                open_group = group
+            
+            if group == 'ul':
+                append(f'<li>{self._inline_to_html(rest)}</li>')
+            elif group == 'p':
+                append(self._inline_to_html(line))
+            elif line.startswith('```'):
+                append('<pre>')
+                in_code = True
+            elif tag:
+                append(f'<{tag}>{rest}</{tag}>')
+            elif stripped == '---':
+                append('<hr/>')
+        
+        if open_group:
+            append(f'</{open_group}>')
         
         return '\n'.join(html)
     
+    def _inline_to_html(self, text):
+        """Convert inline markdown (bold, code spans) to HTML"""
+        text = _STRONG_RE.sub(r'<strong>\1</strong>', text)
+        return _CODE_RE.sub(r'<code>\1</code>', text)
+    
     def aggregate_all_repos(self, output_file=None):
         """Generate combined devlog from all tracked repositories"""
         if not self.repos:
@@ -528,45 +703,52 @@ echo "📝 DEVLOG.md updated"
             print("Run 'gitjournal --init' in your repositories first.")
             return None
         
-        all_commits = []
-        
+        repo_paths = {}
         for repo_name, repo_info in self.repos.items():
             repo_path = repo_info['path']
             if not os.path.exists(repo_path):
                 print(f"⚠️  Repository not found: {repo_path}")
                 continue
-            
-            commits = self._get_commits(limit=20, cwd=repo_path)
+            repo_paths[repo_name] = repo_path
+        
+        by_date = itemgetter('date')
+        
+        def fetch(item):
+            # Spawning inside the worker caps concurrent git processes (and
+            # their pipe FDs) at MAX_WORKERS while repos still run in parallel
+            repo_name, repo_path = item
+            commits = list(self._iter_commits(limit=20, cwd=repo_path))
             for commit in commits:
                 commit['repo'] = repo_name
-                all_commits.append(commit)
+            # git orders by commit date; the log shows author dates
+            commits.sort(key=by_date, reverse=True)
+            return commits
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            per_repo = list(executor.map(fetch, repo_paths.items()))
         
-        # Sort by date (newest first)
-        all_commits.sort(key=lambda x: x['date'], reverse=True)
+        # Lazily merge the per-repo streams, newest first
+        merged = heapq.merge(*per_repo, key=by_date, reverse=True)
         
-        devlog = f"""# Combined Development Log
+        parts = [f"""# Combined Development Log
 
 Activity across all tracked repositories.
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
 Repositories: {', '.join(self.repos.keys())}
 
-"""
+"""]
+        append = parts.append
         
         current_date = None
-        for commit in all_commits[:100]:  # Last 100 commits across all repos
-            if commit['message'].startswith('Merge'):
-                continue
-            
+        for commit in islice(merged, 100):  # Last 100 commits across all repos
             if commit['date'] != current_date:
                 current_date = commit['date']
-                devlog += f"\n## {current_date}\n\n"
+                append(f"\n## {current_date}\n\n")
             
-            devlog += f"**[{commit['repo']}]** {commit['message']} (`{commit['hash']}`)\n\n"
+            append(f"**[{commit['repo']}]** {commit['message']} (`{commit['hash']}`)\n\n")
         
-        output_file = output_file or os.path.join(CONFIG_DIR, 'COMBINED_DEVLOG.md')
-        
-        with open(output_file, 'w') as f:
-            f.write(devlog)
+        output_file = Path(output_file or os.path.join(CONFIG_DIR, 'COMBINED_DEVLOG.md'))
+        output_file.write_text(''.join(parts), encoding='utf-8')
         
         print(f"✅ Generated combined devlog: {output_file}")
         return output_file
@@ -598,24 +780,57 @@ Repositories: {', '.join(self.repos.keys())}
         print(f"\n🔍 Scanning for git repositories in: {search_path}")
         print(f"   (max depth: {max_depth})\n")
         
-        for root, dirs, files in os.walk(search_path):
-            # Calculate depth
-            depth = root.replace(search_path, '').count(os.sep)
-            if depth >= max_depth:
-                dirs[:] = []  # Don't go deeper
-                continue
-            
-            # Skip hidden directories and common non-repo folders
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in 
-                      ['node_modules', 'venv', 'env', '__pycache__', 'vendor', 'build', 'dist']]
-            
-            # Check if this is a git repo
-            if '.git' in os.listdir(root):
-                repos_found.append(root)
-                dirs[:] = []  # Don't go into subdirectories of a repo
-        
+        self._walk_repos(search_path, max_depth, repos_found)
         return repos_found
     
+    def _walk_repos(self, root, depth, repos_found):
+        """Collect git repositories under root, checking at most depth levels"""
+        if depth <= 0:
+            return
+        
+        # Check if this is a git repo (a single stat instead of listing root)
+        if os.path.exists(os.path.join(root, '.git')):
+            repos_found.append(root)
+            return  # Don't go into subdirectories of a repo
+        
+        if depth == 1:
+            return
+        
+        # Skip hidden directories and common non-repo folders; d_type from
+        # scandir answers is_dir() without an extra stat per entry
+        try:
+            with os.scandir(root) as entries:
+                subdirs = [
+                    entry.path for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                    and not entry.name.startswith('.')
+                    and entry.name not in SKIP_DIRS
+                ]
+        except OSError:
+            return
+        
+        for subdir in subdirs:
+            self._walk_repos(subdir, depth - 1, repos_found)
+    
+    def _run_in_repos(self, repo_paths, task):
+        """Run task(journal) per repo in parallel, yielding (repo_path, result, output)"""
+        def run(repo_path):
+            # Buffer each repo's progress lines so they don't interleave
+            out = io.StringIO()
+            journal = GitJournal(repo_path=repo_path, out=out)
+            try:
+                result = task(journal)
+            except Exception as e:
+                print(f"   ❌ Error: {e}", file=out)
+                result = None
+            return result, out.getvalue()
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(run, path): path for path in repo_paths}
+            for future in as_completed(futures):
+                result, output = future.result()
+                yield futures[future], result, output
+    
     def scan_and_init(self, search_path, max_depth=3):
         """Scan directory for repos and initialize all of them"""
         repos = self.find_repos(search_path, max_depth)
@@ -638,18 +853,23 @@ Repositories: {', '.join(self.repos.keys())}
         
         print("\n" + "="*60)
         
+        def init(journal):
+            # Tracking is saved once below, not by each worker
+            if journal.init_repo(save=False):
+                repo_name = journal.repo_name
+                return repo_name, journal.repos[repo_name]
+        
         initialized = 0
-        for repo_path in repos:
+        for repo_path, tracked, output in self._run_in_repos(repos, init):
             print(f"\n📁 {os.path.basename(repo_path)}")
-            
-            # Create a new journal instance for this repo
-            journal = GitJournal(repo_path=repo_path)
-            
-            try:
-                journal.init_repo()
+            print(output, end='')
+            if tracked:
+                repo_name, repo_info = tracked
+                self.repos[repo_name] = repo_info
                 initialized += 1
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+        
+        if initialized:
+            self._save_repos()
         
         print("\n" + "="*60)
         print(f"\n✅ Initialized {initialized}/{len(repos)} repositories")
@@ -665,7 +885,7 @@ Repositories: {', '.join(self.repos.keys())}
         print(f"\n📝 Generating logs for {len(self.repos)} repositories...\n")
         print("="*60)
         
-        success = 0
+        repo_names = {}
         for repo_name, repo_info in self.repos.items():
             repo_path = repo_info['path']
             
@@ -673,17 +893,20 @@ Repositories: {', '.join(self.repos.keys())}
                 print(f"\n❌ {repo_name}: Path not found")
                 continue
             
-            print(f"\n📁 {repo_name}")
-            
-            journal = GitJournal(repo_path=repo_path)
-            
-            try:
-                journal.generate_devlog()
-                if changelog:
-                    journal.generate_changelog()
+            repo_names[repo_path] = repo_name
+        
+        def generate(journal):
+            journal.generate_devlog()
+            if changelog:
+                journal.generate_changelog()
+            return True
+        
+        success = 0
+        for repo_path, ok, output in self._run_in_repos(repo_names, generate):
+            print(f"\n📁 {repo_names[repo_path]}")
+            print(output, end='')
+            if ok:
                 success += 1
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
         
         print("\n" + "="*60)
         print(f"\n✅ Generated logs for {success}/{len(self.repos)} repositories")
@@ -712,6 +935,8 @@ Examples:
     parser.add_argument('--changelog', action='store_true', help='Generate CHANGELOG.md')
     parser.add_argument('--init', action='store_true', help='Initialize journaling for current repo')
     parser.add_argument('--install-hook', action='store_true', help='Install post-commit hook only')
+    parser.add_argument('--hook-update', action='store_true', help='Record latest commit in the journal (used by the hook)')
+    parser.add_argument('--compact', action='store_true', help='Regenerate DEVLOG.md from hook journal entries')
     parser.add_argument('--export-html', action='store_true', help='Export to OneNote HTML')
     parser.add_argument('--all-repos', action='store_true', help='Aggregate all tracked repos into one log')
     parser.add_argument('--list', action='store_true', help='List tracked repositories')
@@ -737,6 +962,10 @@ Examples:
         journal.aggregate_all_repos()
     elif args.init:
         journal.init_repo()
+    elif args.hook_update:
+        journal.hook_update()
+    elif args.compact:
+        journal.compact_devlog()
     elif args.install_hook:
         journal.install_hook()
     elif args.changelog: